@@ -1,8 +1,11 @@
 #!/usr/bin/env python3
-import argparse, re, pandas as pd
+import argparse, re, numpy as np, pandas as pd
 
 RS_HASH = re.compile(r"^(?P<base>.+)-[a-f0-9]{9,}$")          # e.g. myapp-75b8db778
 POD_FROM_RS = re.compile(r"^(?P<base>.+)-[a-f0-9]{9,}-[a-z0-9]{5}$")  # myapp-75b8db778-abcde
+# Suffix forms of the above for vectorized str.replace (lookbehind keeps base non-empty)
+RS_SUFFIX = re.compile(r"(?<=.)-[a-f0-9]{9,}$")
+POD_SUFFIX = re.compile(r"(?<=.)-[a-f0-9]{9,}(?:-[a-z0-9]{5})?$")
 
 def canon_workload(kind: str, name: str) -> tuple[str, str]:
     """Return (canon_kind, canon_name) suitable to match Deployment features."""
@@ -20,6 +23,20 @@ def canon_workload(kind: str, name: str) -> tuple[str, str]:
     # Pass through DaemonSet/StatefulSet/Job/CronJob (may not match features)
     return kind, name
 
+def canon_columns(df: pd.DataFrame) -> tuple[np.ndarray, np.ndarray]:
+    """Vectorized canon_workload over the workload_kind/workload_name columns."""
+    def col(c):
+        s = df[c] if c in df.columns else pd.Series("", index=df.index)
+        return s.fillna("").astype(str).str.strip()
+    kind, name = col("workload_kind"), col("workload_name")
+    rs_base = name.str.replace(RS_SUFFIX, "", regex=True)
+    pod_base = name.str.replace(POD_SUFFIX, "", regex=True)
+    is_rs = kind.eq("ReplicaSet")
+    pod_match = kind.eq("Pod") & pod_base.ne(name)
+    canon_name = np.where(is_rs, rs_base, np.where(pod_match, pod_base, name))
+    canon_kind = np.where(is_rs | pod_match, "Deployment", kind)
+    return canon_kind, canon_name
+
 def norm_keys(df: pd.DataFrame) -> pd.DataFrame:
     df = df.copy()
     for c in ("namespace", "workload_kind", "workload_name"):
@@ -29,6 +46,23 @@ def norm_keys(df: pd.DataFrame) -> pd.DataFrame:
         df["namespace"] = df["namespace"].str.lower()
     return df
 
+def align_categories(dfs, cols) -> None:
+    """Cast key columns of all frames to category over a shared vocabulary (merges hash int codes)."""
+    for c in cols:
+        have = [d for d in dfs if c in d.columns]
+        if not have:
+            continue
+        cats = pd.unique(np.concatenate([d[c].dropna().astype(str).unique() for d in have]))
+        for d in have:
+            d[c] = pd.Categorical(d[c], categories=cats)
+
+def uncategorize(df: pd.DataFrame) -> pd.DataFrame:
+    """Cast category columns back to plain strings so written Parquet keeps string (not dictionary) columns."""
+    for c in df.columns:
+        if isinstance(df[c].dtype, pd.CategoricalDtype):
+            df[c] = df[c].astype(object)
+    return df
+
 def main():
     ap = argparse.ArgumentParser()
     ap.add_argument("--features", required=True)
@@ -43,24 +77,23 @@ def main():
     L = norm_keys(L)
 
     # Canonicalize BOTH sides (features are usually already Deployment, but harmless)
-    F[['canon_kind','canon_name']] = F.apply(
-        lambda r: pd.Series(canon_workload(r.get('workload_kind',''), r.get('workload_name',''))), axis=1
-    )
-    L[['canon_kind','canon_name']] = L.apply(
-        lambda r: pd.Series(canon_workload(r.get('workload_kind',''), r.get('workload_name',''))), axis=1
-    )
+    F['canon_kind'], F['canon_name'] = canon_columns(F)
+    L['canon_kind'], L['canon_name'] = canon_columns(L)
+    align_categories([F, L], ("namespace", "canon_name", "canon_kind"))
 
     # Join by namespace + canonical name (ignore kind to be more tolerant)
     left = L.rename(columns={"namespace":"ns"})  # avoid column collisions in merge suffixes
     right = F.rename(columns={"namespace":"ns"})
     keepF = [c for c in ['_spec_hash','features'] if c in right.columns]
 
-    J = left.merge(
-        right[['ns','canon_name'] + keepF],
-        on=['ns','canon_name'],
+    # Index join over sorted (ns, canon_name) keys instead of a hash merge
+    left = left.set_index(['ns','canon_name']).sort_index()
+    right = right.set_index(['ns','canon_name'])[keepF].sort_index()
+    J = left.join(
+        right,
         how='inner',
-        suffixes=('_lab', '_feat'),
-    ).rename(columns={"ns":"namespace"})
+        lsuffix='_lab', rsuffix='_feat',
+    ).reset_index().rename(columns={"ns":"namespace"})
 
     if len(J) == 0:
         print('[WARN] 0 rows joined. Diagnostics:')
@@ -73,7 +106,7 @@ def main():
         print('  sample features:\n', F[['namespace','workload_kind','workload_name']].drop_duplicates().head(10).to_string(index=False))
         print('  sample labels:\n',   L[['namespace','workload_kind','workload_name']].drop_duplicates().head(10).to_string(index=False))
 
-    J.to_parquet(args.out, index=False)
+    uncategorize(J).to_parquet(args.out, index=False)
     print(f'[OK] joined {len(J)} rows -> {args.out}')
 
 if __name__ == "__main__":
@@ -1,21 +1,28 @@
 # k8s_collect.py
 import os
-import json
+import re
 import argparse
+import atexit
+import signal
+import sys
 import time
-from collections import OrderedDict
+import queue
+import threading
+import orjson
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from functools import lru_cache
-from typing import Dict, List, Optional, Iterable, Tuple
+from typing import Callable, Dict, List, Optional, Iterable, Tuple
 
 try:
     import requests
 except Exception:
     requests = None
 
-from kubernetes import client, config, watch
+from kubernetes import client, config
 from kubernetes.config.config_exception import ConfigException
 from kubernetes.client.exceptions import ApiException
-from pydantic import ValidationError
+from pydantic import TypeAdapter, ValidationError
 
 # If you have your logger, you can import it; otherwise basic prints will work.
 try:
@@ -26,91 +33,226 @@ except Exception:
     logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
     logger = logging.getLogger("energetiscope")
 
-from models import InferenceRequest, ContainerSpec
+from models import InferenceRequest
+
+# Collectors build plain dicts (serialized once with orjson); validate only on demand.
+_IR_ADAPTER = TypeAdapter(InferenceRequest)
+
+
+def to_model(d: Dict) -> InferenceRequest:
+    """Validate a collector dict into an InferenceRequest."""
+    return _IR_ADAPTER.validate_python(d)
 
 
 # --- io helpers ---
-def _open_output(path: Optional[str]):
+class BatchWriter:
+    """
+    Append-only NDJSON sink. Lines are buffered and written with one os.write()
+    per batch: when the buffer reaches flush_bytes, or every flush_interval
+    seconds from a background thread. close() (also run at exit) flushes the rest.
+    """
+    def __init__(self, path: str, flush_bytes: int = 64 * 1024, flush_interval: float = 0.1):
+        self._fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        self.flush_bytes = flush_bytes
+        self.flush_interval = flush_interval
+        self._buf = bytearray()
+        self._lock = threading.Lock()
+        self._closed = threading.Event()
+        self._flusher = threading.Thread(target=self._flush_loop, name="ndjson-flush", daemon=True)
+        self._flusher.start()
+        atexit.register(self.close)
+
+    def write(self, data: bytes) -> None:
+        with self._lock:
+            self._buf += data
+            if len(self._buf) >= self.flush_bytes:
+                self._flush_locked()
+
+    def flush(self) -> None:
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self) -> None:
+        view = memoryview(self._buf)
+        try:
+            while view:
+                view = view[os.write(self._fd, view):]
+        finally:
+            view.release()
+        self._buf = bytearray()
+
+    def _flush_loop(self) -> None:
+        while not self._closed.wait(self.flush_interval):
+            self.flush()
+
+    def close(self) -> None:
+        if self._closed.is_set():
+            return
+        self._closed.set()
+        self._flusher.join()
+        self.flush()
+        os.close(self._fd)
+
+
+def _open_output(path: Optional[str]) -> Optional[BatchWriter]:
     if not path:
         return None
     os.makedirs(os.path.dirname(path), exist_ok=True)
-    return open(path, "a", buffering=1)  # line-buffered
+    return BatchWriter(path)
 
 
-def _post_if_needed(ir, url: Optional[str]):
-    if not url:
-        return
-    if requests is None:
-        logger.error("requests not installed; cannot POST. pip install requests")
-        return
+POST_WORKERS = 8
+POST_MAX_INFLIGHT = 256
+
+_SESSION = None
+_POST_POOL: Optional[ThreadPoolExecutor] = None
+_POST_INFLIGHT: deque = deque()
+
+
+def _session():
+    """One keep-alive Session (pooled connections) for all POSTs."""
+    global _SESSION
+    if _SESSION is None:
+        from requests.adapters import HTTPAdapter
+        s = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=POST_WORKERS * 2, pool_block=False)
+        s.mount("http://", adapter)
+        s.mount("https://", adapter)
+        _SESSION = s
+    return _SESSION
+
+
+def _do_post(body: bytes, url: str) -> None:
     try:
-        r = requests.post(url, json=json.loads(ir.model_dump_json()), timeout=5)
+        r = _session().post(url, data=body, headers={"Content-Type": "application/json"}, timeout=5)
         if r.status_code >= 300:
             logger.warning("POST %s -> %s: %s", url, r.status_code, r.text[:200])
     except Exception as e:
         logger.warning("POST error to %s: %s", url, e)
 
 
+def _post_if_needed(d: Dict, url: Optional[str]):
+    """Queue a POST on the worker pool; blocks only when POST_MAX_INFLIGHT are pending."""
+    global _POST_POOL
+    if not url:
+        return
+    if requests is None:
+        logger.error("requests not installed; cannot POST. pip install requests")
+        return
+    if _POST_POOL is None:
+        _session()
+        _POST_POOL = ThreadPoolExecutor(max_workers=POST_WORKERS, thread_name_prefix="post")
+    while _POST_INFLIGHT and (_POST_INFLIGHT[0].done() or len(_POST_INFLIGHT) >= POST_MAX_INFLIGHT):
+        _POST_INFLIGHT.popleft().result()
+    _POST_INFLIGHT.append(_POST_POOL.submit(_do_post, orjson.dumps(d), url))
+
+
 class SeenCache:
+    """
+    TTL + size-bounded set of recently seen keys; seen() is amortized O(1).
+    _d maps key -> expiry; _q holds (expiry, key) in insertion order, so stale
+    queue entries (key re-seen later) are skipped on eviction.
+    """
     def __init__(self, ttl_sec=10, max_items=5000):
         self.ttl = ttl_sec
         self.max = max_items
-        self._d = OrderedDict()
+        self._d: Dict = {}
+        self._q: deque = deque()
+        self._lock = threading.Lock()  # shared by the per-kind watch threads
 
     def seen(self, key):
-        now = time.time()
-        # purge old
-        while self._d and (now - next(iter(self._d.values())) > self.ttl):
-            self._d.popitem(last=False)
+        with self._lock:
+            return self._seen(key)
+
+    def _seen(self, key):
+        now = time.monotonic()
+        # purge expired
+        while self._q and self._q[0][0] <= now:
+            exp, k = self._q.popleft()
+            if self._d.get(k) == exp:
+                del self._d[k]
         # record & return previous existence
         existed = key in self._d
-        self._d[key] = now
-        if len(self._d) > self.max:
-            self._d.popitem(last=False)
+        exp = now + self.ttl
+        self._d[key] = exp
+        self._q.append((exp, key))
+        # enforce size bound (oldest first)
+        while len(self._d) > self.max:
+            old_exp, k = self._q.popleft()
+            if self._d.get(k) == old_exp:
+                del self._d[k]
         return existed
 
 
 # ---------- Quantity parsers ----------
+_QTY_RE = re.compile(r"^\s*([+-]?(?:\d+(?:\.\d*)?|\.\d+)(?:[eE][+-]?\d+)?)\s*([kmgtpe]i?)?\s*$", re.I)
+_CPU_MULT = {"": 1000.0, "m": 1.0}
+_MEM_MULT = {
+    "": 1 / (1024 * 1024),
+    "k": 1 / 1024, "ki": 1 / 1024,
+    "m": 1, "mi": 1,
+    "g": 1024, "gi": 1024,
+    "t": 1024 * 1024, "ti": 1024 * 1024,
+    "p": 1024 ** 3, "pi": 1024 ** 3,
+    "e": 1024 ** 4, "ei": 1024 ** 4,
+}
+
+
+def _parse_qty(q, table: Dict[str, float]) -> Optional[int]:
+    m = _QTY_RE.match(str(q))
+    if not m:
+        return None
+    mul = table.get((m.group(2) or "").lower())
+    if mul is None:
+        return None
+    return int(float(m.group(1)) * mul)
+
+
 def parse_cpu_to_mcpu(q: Optional[str]) -> Optional[int]:
     if not q:
         return None
-    s = str(q).strip().lower()
-    if s.endswith("m"):
-        return int(float(s[:-1]))
-    return int(float(s) * 1000)
+    if isinstance(q, (int, float)):
+        return int(q * 1000)
+    return _parse_qty(q, _CPU_MULT)
 
 
 def parse_mem_to_mib(q: Optional[str]) -> Optional[int]:
     if not q:
         return None
-    s = str(q).strip().lower()
-    multipliers = {
-        "k": 1 / 1024, "ki": 1 / 1024,
-        "m": 1, "mi": 1,
-        "g": 1024, "gi": 1024,
-        "t": 1024 * 1024, "ti": 1024 * 1024,
-    }
-    for suf, mul in multipliers.items():
-        if s.endswith(suf):
-            val = float(s[: -len(suf)])
-            return int(val * mul)
-    try:
-        bytes_val = float(s)
-        return int(bytes_val / (1024 * 1024))
-    except ValueError:
-        return None
+    if isinstance(q, (int, float)):
+        return int(q / (1024 * 1024))
+    return _parse_qty(q, _MEM_MULT)
 
 
 # ---------- Extractors ----------
+_VOL_KEYS = frozenset({
+    "emptyDir", "hostPath", "persistentVolumeClaim", "configMap",
+    "secret", "downwardAPI", "projected", "nfs", "ephemeral"
+})
+_GPU_KEYS = ("nvidia.com/gpu", "amd.com/gpu", "gpu.intel.com/i915")
+
+
 def _vol_type(v: Dict) -> str:
-    keys = {
-        "emptyDir", "hostPath", "persistentVolumeClaim", "configMap",
-        "secret", "downwardAPI", "projected", "nfs", "ephemeral"
-    }
-    for k in keys:
-        if k in v:
-            return k
-    return "other"
+    # a volume carries exactly one source field
+    return next(iter(_VOL_KEYS & v.keys()), "other")
+
+
+def _gpu_count(containers: List[Dict]) -> int:
+    """Sum GPU limits: well-known resource names first, any '*gpu*' key as fallback."""
+    total = 0
+    for c in containers:
+        lim = (c.get("resources") or {}).get("limits") or {}
+        if not lim:
+            continue
+        vals = [lim[k] for k in _GPU_KEYS if k in lim]
+        if not vals:
+            vals = [v for k, v in lim.items() if "gpu" in k]
+        for v in vals:
+            try:
+                total += int(float(v))
+            except Exception:
+                pass
+    return total
 
 
 def _cronjob_pod_template(d: Dict) -> Dict:
@@ -120,20 +262,20 @@ def _cronjob_pod_template(d: Dict) -> Dict:
     return jt_spec.get("template") or {}
 
 
-def _to_container_spec(c: Dict) -> ContainerSpec:
+def _to_container_spec(c: Dict) -> Dict:
     res = c.get("resources", {}) or {}
     req = res.get("requests", {}) or {}
     lim = res.get("limits", {}) or {}
-    return ContainerSpec(
-        name=c.get("name", ""),
-        image=c.get("image", ""),
-        command=c.get("command"),
-        args=c.get("args"),
-        req_cpu_mcpu=parse_cpu_to_mcpu(req.get("cpu")),
-        req_mem_mib=parse_mem_to_mib(req.get("memory")),
-        lim_cpu_mcpu=parse_cpu_to_mcpu(lim.get("cpu")),
-        lim_mem_mib=parse_mem_to_mib(lim.get("memory")),
-    )
+    return {
+        "name": c.get("name", ""),
+        "image": c.get("image", ""),
+        "command": c.get("command"),
+        "args": c.get("args"),
+        "req_cpu_mcpu": parse_cpu_to_mcpu(req.get("cpu")),
+        "req_mem_mib": parse_mem_to_mib(req.get("memory")),
+        "lim_cpu_mcpu": parse_cpu_to_mcpu(lim.get("cpu")),
+        "lim_mem_mib": parse_mem_to_mib(lim.get("memory")),
+    }
 
 
 def _count_sidecars(containers: List[Dict]) -> int:
@@ -147,7 +289,8 @@ def podtemplate_to_request(
     workload_name: str,
     pod_template: Dict,
     parent_spec: Optional[Dict] = None,
-) -> InferenceRequest:
+) -> Dict:
+    """InferenceRequest-shaped dict for a pod template (see to_model)."""
     meta = pod_template.get("metadata", {}) or {}
     spec = pod_template.get("spec", {}) or {}
 
@@ -166,15 +309,7 @@ def podtemplate_to_request(
     )
 
     # GPU (limits.*gpu*)
-    gpu_count = 0
-    for c in (spec.get("containers") or []):
-        lim = (c.get("resources") or {}).get("limits") or {}
-        for k, v in lim.items():
-            if "gpu" in k:
-                try:
-                    gpu_count += int(float(v))
-                except Exception:
-                    pass
+    gpu_count = _gpu_count(spec.get("containers") or [])
 
     parallelism = None
     completions = None
@@ -182,25 +317,27 @@ def podtemplate_to_request(
         parallelism = parent_spec.get("parallelism")
         completions = parent_spec.get("completions")
 
-    return InferenceRequest(
-        namespace=namespace,
-        workload_kind=workload_kind,
-        workload_name=workload_name,
-        labels=labels,
-        annotations=annotations,
-        containers=containers,
-        init_container_count=init_count,
-        sidecar_count=_count_sidecars(spec.get("containers") or []),
-        volume_types=volume_types,
-        node_type=node_type,
-        runtime_class=runtime_class,
-        gpu_count=gpu_count,
-        parallelism=parallelism,
-        completions=completions,
-    )
+    return {
+        "schema_version": "v1",
+        "namespace": namespace,
+        "workload_kind": workload_kind,
+        "workload_name": workload_name,
+        "labels": labels,
+        "annotations": annotations,
+        "containers": containers,
+        "init_container_count": init_count,
+        "sidecar_count": _count_sidecars(spec.get("containers") or []),
+        "volume_types": volume_types,
+        "node_type": node_type,
+        "runtime_class": runtime_class,
+        "gpu_count": gpu_count,
+        "parallelism": parallelism,
+        "completions": completions,
+    }
 
 
-def pod_to_request(pod: Dict) -> InferenceRequest:
+def pod_to_request(pod: Dict) -> Dict:
+    """InferenceRequest-shaped dict for a bare Pod (see to_model)."""
     ns = pod["metadata"]["namespace"]
     name = pod["metadata"]["name"]
     labels = dict(pod["metadata"].get("labels") or {})
@@ -223,15 +360,7 @@ def pod_to_request(pod: Dict) -> InferenceRequest:
     )
 
     # gpu count
-    gpu_count = 0
-    for c in (spec.get("containers") or []):
-        lim = (c.get("resources") or {}).get("limits") or {}
-        for k, v in lim.items():
-            if "gpu" in k:
-                try:
-                    gpu_count += int(float(v))
-                except Exception:
-                    pass
+    gpu_count = _gpu_count(spec.get("containers") or [])
 
     # try to infer owner workload kind/name, else treat as Pod
     workload_kind = "Pod"
@@ -242,22 +371,23 @@ def pod_to_request(pod: Dict) -> InferenceRequest:
         workload_name = ref.get("name") or workload_name
         break
 
-    return InferenceRequest(
-        namespace=ns,
-        workload_kind=workload_kind,
-        workload_name=workload_name,
-        labels=labels,
-        annotations=annotations,
-        containers=containers,
-        init_container_count=init_count,
-        sidecar_count=_count_sidecars(spec.get("containers") or []),
-        volume_types=volume_types,
-        node_type=node_type,
-        runtime_class=runtime_class,
-        gpu_count=gpu_count,
-        parallelism=None,
-        completions=None,
-    )
+    return {
+        "schema_version": "v1",
+        "namespace": ns,
+        "workload_kind": workload_kind,
+        "workload_name": workload_name,
+        "labels": labels,
+        "annotations": annotations,
+        "containers": containers,
+        "init_container_count": init_count,
+        "sidecar_count": _count_sidecars(spec.get("containers") or []),
+        "volume_types": volume_types,
+        "node_type": node_type,
+        "runtime_class": runtime_class,
+        "gpu_count": gpu_count,
+        "parallelism": None,
+        "completions": None,
+    }
 
 
 # ---------- K8s config & clients (mirrors your reference style) ----------
@@ -284,37 +414,182 @@ def _load_k8s_config(kubeconfig: Optional[str] = None) -> None:
             raise
 
 
-def _apply_ssl_settings(ca_file: Optional[str], verify_ssl: Optional[bool]) -> None:
-    cfg = client.Configuration.get_default_copy()
-    if verify_ssl is not None:
-        cfg.verify_ssl = bool(verify_ssl)
-    if ca_file:
-        cfg.ssl_ca_cert = ca_file
-    client.Configuration.set_default(cfg)
+_CLIENT_LOCK = threading.Lock()
+_API_CLIENT: Optional[client.ApiClient] = None
+
+
+def _ensure_client(kubeconfig: Optional[str], ca_file: Optional[str], verify_ssl: Optional[bool]) -> client.ApiClient:
+    """
+    Load kube config once and share a single ApiClient (one Configuration,
+    one connection pool) between all typed APIs and watch threads.
+    """
+    global _API_CLIENT
+    with _CLIENT_LOCK:
+        if _API_CLIENT is not None:
+            return _API_CLIENT
+        _load_k8s_config(kubeconfig)
+        cfg = client.Configuration.get_default_copy()
+        if verify_ssl is not None:
+            cfg.verify_ssl = bool(verify_ssl)
+        if ca_file:
+            cfg.ssl_ca_cert = ca_file
+        _API_CLIENT = client.ApiClient(configuration=cfg)
+        return _API_CLIENT
 
 
 @lru_cache()
 def get_apps_api(kubeconfig: Optional[str], ca_file: Optional[str], verify_ssl: Optional[bool]) -> client.AppsV1Api:
-    _load_k8s_config(kubeconfig)
-    _apply_ssl_settings(ca_file, verify_ssl)
-    return client.AppsV1Api()
+    return client.AppsV1Api(_ensure_client(kubeconfig, ca_file, verify_ssl))
 
 
 @lru_cache()
 def get_batch_api(kubeconfig: Optional[str], ca_file: Optional[str], verify_ssl: Optional[bool]) -> client.BatchV1Api:
-    _load_k8s_config(kubeconfig)
-    _apply_ssl_settings(ca_file, verify_ssl)
-    return client.BatchV1Api()
+    return client.BatchV1Api(_ensure_client(kubeconfig, ca_file, verify_ssl))
 
 
 @lru_cache()
 def get_core_api(kubeconfig: Optional[str], ca_file: Optional[str], verify_ssl: Optional[bool]) -> client.CoreV1Api:
-    _load_k8s_config(kubeconfig)
-    _apply_ssl_settings(ca_file, verify_ssl)
-    return client.CoreV1Api()
+    return client.CoreV1Api(_ensure_client(kubeconfig, ca_file, verify_ssl))
 
 
 # ---------- Watchers ----------
+WATCH_TIMEOUT_SEC = 300
+WATCH_BACKOFF_MAX_SEC = 60
+LIST_PAGE_LIMIT = 500
+
+
+def _list_fns(api_apps, api_batch, api_core) -> Dict[str, Callable]:
+    return {
+        "Deployment": api_apps.list_deployment_for_all_namespaces,
+        "Job": api_batch.list_job_for_all_namespaces,
+        "CronJob": api_batch.list_cron_job_for_all_namespaces,
+        "Pod": api_core.list_pod_for_all_namespaces,
+    }
+
+
+def _raw_call(fn: Callable, **kwargs):
+    """Call a list_* endpoint without model deserialization; returns the urllib3 response.
+    Non-2xx responses are raised as ApiException by the client itself (handled by callers)."""
+    return fn(_preload_content=False, **kwargs)
+
+
+def _iter_raw_items(list_fn: Callable) -> Iterable[Dict]:
+    """Page through a list_* endpoint, yielding raw (camelCase) object dicts."""
+    token = None
+    while True:
+        kwargs = {"limit": LIST_PAGE_LIMIT}
+        if token:
+            kwargs["_continue"] = token
+        resp = _raw_call(list_fn, **kwargs)
+        try:
+            data = orjson.loads(resp.data)
+        finally:
+            resp.release_conn()
+        yield from data.get("items") or []
+        token = (data.get("metadata") or {}).get("continue")
+        if not token:
+            return
+
+
+def _iter_json_lines(resp) -> Iterable[Dict]:
+    """Incrementally split a streamed watch response on newlines and parse each event."""
+    buf = bytearray()
+    for chunk in resp.stream(amt=None, decode_content=False):
+        buf.extend(chunk)
+        start = 0
+        nl = buf.find(b"\n")
+        while nl != -1:
+            line = bytes(buf[start:nl])
+            start = nl + 1
+            if line.strip():
+                yield orjson.loads(line)
+            nl = buf.find(b"\n", start)
+        del buf[:start]
+
+
+def handle_obj(
+    kind: str,
+    obj: Dict,
+    namespaces: Optional[List[str]],
+    seen_cache: "SeenCache",
+) -> List[Dict]:
+    """Turn one raw (camelCase) object dict into zero or more InferenceRequest dicts."""
+    ns = obj["metadata"]["namespace"]
+    name = obj["metadata"]["name"]
+    rv = obj["metadata"].get("resourceVersion") or "0"
+    key = (ns, kind, name, rv)
+    if seen_cache.seen(key):
+        return []
+    if namespaces and ns not in namespaces:
+        return []
+    if kind == "Deployment":
+        tmpl = obj["spec"]["template"]
+        return [podtemplate_to_request(ns, "Deployment", name, tmpl)]
+    if kind == "Job":
+        tmpl = obj["spec"]["template"]
+        return [podtemplate_to_request(ns, "Job", name, tmpl, parent_spec=obj["spec"])]
+    if kind == "CronJob":
+        tmpl = _cronjob_pod_template(obj)
+        return [podtemplate_to_request(ns, "CronJob", name, tmpl)] if tmpl else []
+    if kind == "Pod":
+        return [pod_to_request(obj)]
+    return []
+
+
+def _watch_kind(
+    kind: str,
+    list_fn: Callable,
+    q: "queue.Queue",
+    stop_event: threading.Event,
+    namespaces: Optional[List[str]],
+    seen_cache: "SeenCache",
+) -> None:
+    """
+    Watch one kind forever, pushing InferenceRequest dicts onto q.
+    Resumes from the last resourceVersion; backs off exponentially on errors.
+    """
+    last_rv: Optional[str] = None
+    backoff = 1.0
+    while not stop_event.is_set():
+        kwargs = {"timeout_seconds": WATCH_TIMEOUT_SEC, "allow_watch_bookmarks": True}
+        if last_rv:
+            kwargs["resource_version"] = last_rv
+        try:
+            resp = _raw_call(list_fn, watch=True, **kwargs)
+            try:
+                for event in _iter_json_lines(resp):
+                    if stop_event.is_set():
+                        break
+                    etype = event.get("type")
+                    obj = event.get("object") or {}
+                    if etype == "ERROR":
+                        raise ApiException(status=obj.get("code"),
+                                           reason=f"{obj.get('reason')}: {obj.get('message')}")
+                    last_rv = (obj.get("metadata") or {}).get("resourceVersion") or last_rv
+                    backoff = 1.0
+                    if etype not in ("ADDED", "MODIFIED"):
+                        continue
+                    for ir in handle_obj(kind, obj, namespaces, seen_cache):
+                        q.put(ir)
+            finally:
+                resp.close()
+                resp.release_conn()
+        except ApiException as e:
+            if e.status == 410:
+                # resourceVersion too old: restart from "now"
+                logger.warning("%s watch expired (410); restarting without resourceVersion.", kind)
+                last_rv = None
+                continue
+            logger.warning("%s watch K8s API error: %s (status: %s); retry in %.0fs",
+                           kind, e.reason, e.status, backoff)
+            stop_event.wait(backoff)
+            backoff = min(backoff * 2, WATCH_BACKOFF_MAX_SEC)
+        except Exception as e:
+            logger.warning("%s watch error: %s; retry in %.0fs", kind, e, backoff)
+            stop_event.wait(backoff)
+            backoff = min(backoff * 2, WATCH_BACKOFF_MAX_SEC)
+
+
 def stream_inference_requests(
     kinds: Tuple[str, ...] = ("Deployment", "Job", "CronJob"),
     namespaces: Optional[List[str]] = None,
@@ -322,67 +597,52 @@ def stream_inference_requests(
     ca_file: Optional[str] = None,
     verify_ssl: Optional[bool] = None,
     seen_cache: "SeenCache" = None,
-) -> Iterable[InferenceRequest]:
+) -> Iterable[Dict]:
     """
-    Watch K8s and yield InferenceRequest on ADDED/MODIFIED events.
+    Watch K8s and yield InferenceRequest dicts on ADDED/MODIFIED events.
+    One watch thread per kind; results are multiplexed through a queue.
     """
-    w = watch.Watch()
-    api_apps = get_apps_api(kubeconfig, ca_file, verify_ssl)
-    api_batch = get_batch_api(kubeconfig, ca_file, verify_ssl)
-    api_core = get_core_api(kubeconfig, ca_file, verify_ssl)
+    try:
+        api_apps = get_apps_api(kubeconfig, ca_file, verify_ssl)
+        api_batch = get_batch_api(kubeconfig, ca_file, verify_ssl)
+        api_core = get_core_api(kubeconfig, ca_file, verify_ssl)
+    except ConfigException as e:
+        raise SystemExit(f"Kubernetes configuration could not be loaded: {e}")
 
     if seen_cache is None:
         seen_cache = SeenCache()
 
-    def handle_obj(kind: str, obj: Dict):
-        ns = obj["metadata"]["namespace"]
-        name = obj["metadata"]["name"]
-        rv = obj["metadata"].get("resourceVersion") or "0"
-        key = (ns, kind, name, rv)
-        if seen_cache.seen(key):
-            return
-        if namespaces and ns not in namespaces:
-            return
-        if kind == "Deployment":
-            tmpl = obj["spec"]["template"]
-            yield podtemplate_to_request(ns, "Deployment", name, tmpl)
-        elif kind == "Job":
-            tmpl = obj["spec"]["template"]
-            yield podtemplate_to_request(ns, "Job", name, tmpl, parent_spec=obj["spec"])
-        elif kind == "CronJob":
-            tmpl = _cronjob_pod_template(obj)
-            if tmpl:
-                yield podtemplate_to_request(ns, "CronJob", name, tmpl)
-        elif kind == "Pod":
-            yield pod_to_request(obj)
+    list_fns = _list_fns(api_apps, api_batch, api_core)
+    q: "queue.Queue[Dict]" = queue.Queue(maxsize=1024)
+    stop_event = threading.Event()
+    done = object()  # per-watcher exit sentinel
+
+    def _run(kind):
+        try:
+            _watch_kind(kind, list_fns[kind], q, stop_event, namespaces, seen_cache)
+        finally:
+            if not stop_event.is_set():
+                q.put(done)
+
+    started = 0
+    for kind in kinds:
+        if kind not in list_fns:
+            logger.warning("Unsupported kind for watch: %s", kind)
+            continue
+        threading.Thread(target=_run, args=(kind,), name=f"watch-{kind}", daemon=True).start()
+        started += 1
+    if not started:
+        raise SystemExit(f"No supported kinds to watch in {list(kinds)}; use {', '.join(list_fns)}.")
 
     try:
-        if "Deployment" in kinds:
-            for event in w.stream(api_apps.list_deployment_for_all_namespaces):
-                if event["type"] in ("ADDED", "MODIFIED"):
-                    yield from handle_obj("Deployment", event["object"].to_dict())
-
-        if "Job" in kinds:
-            for event in w.stream(api_batch.list_job_for_all_namespaces):
-                if event["type"] in ("ADDED", "MODIFIED"):
-                    yield from handle_obj("Job", event["object"].to_dict())
-
-        if "CronJob" in kinds:
-            for event in w.stream(api_batch.list_cron_job_for_all_namespaces):
-                if event["type"] in ("ADDED", "MODIFIED"):
-                    yield from handle_obj("CronJob", event["object"].to_dict())
-        
-        if "Pod" in kinds:
-            for event in w.stream(api_core.list_pod_for_all_namespaces):
-                if event["type"] in ("ADDED", "MODIFIED"):
-                    yield from handle_obj("Pod", event["object"].to_dict())
-    except ApiException as e:
-        msg = f"K8s API error: {e.reason} (status: {e.status})"
-        raise SystemExit(msg)
-    except ConfigException as e:
-        raise SystemExit(f"Kubernetes configuration could not be loaded: {e}")
-    except Exception as e:
-        raise SystemExit(str(e))
+        while started:
+            item = q.get()
+            if item is done:
+                started -= 1
+                continue
+            yield item
+    finally:
+        stop_event.set()
 
 
 def list_and_emit_initial(
@@ -392,65 +652,17 @@ def list_and_emit_initial(
     ca_file: Optional[str],
     verify_ssl: Optional[bool],
     seen_cache: "SeenCache",
-) -> Iterable[InferenceRequest]:
+) -> Iterable[Dict]:
     api_apps = get_apps_api(kubeconfig, ca_file, verify_ssl)
     api_batch = get_batch_api(kubeconfig, ca_file, verify_ssl)
     api_core = get_core_api(kubeconfig, ca_file, verify_ssl)
 
-    if "Deployment" in kinds:
-        for obj in api_apps.list_deployment_for_all_namespaces().items:
-            d = obj.to_dict()
-            ns = d["metadata"]["namespace"]
-            name = d["metadata"]["name"]
-            rv = d["metadata"].get("resourceVersion", "0")
-            key = (ns, "Deployment", name, rv)
-            if seen_cache.seen(key):
-                continue
-            if namespaces and ns not in namespaces:
-                continue
-            tmpl = d["spec"]["template"]
-            yield podtemplate_to_request(ns, "Deployment", name, tmpl)
-
-    if "Job" in kinds:
-        for obj in api_batch.list_job_for_all_namespaces().items:
-            d = obj.to_dict()
-            ns = d["metadata"]["namespace"]
-            name = d["metadata"]["name"]
-            rv = d["metadata"].get("resourceVersion", "0")
-            key = (ns, "Job", name, rv)
-            if seen_cache.seen(key):
-                continue
-            if namespaces and ns not in namespaces:
-                continue
-            tmpl = d["spec"]["template"]
-            yield podtemplate_to_request(ns, "Job", name, tmpl, parent_spec=d["spec"])
-
-    if "CronJob" in kinds:
-        for obj in api_batch.list_cron_job_for_all_namespaces().items:
-            d = obj.to_dict()
-            ns = d["metadata"]["namespace"]
-            name = d["metadata"]["name"]
-            rv = d["metadata"].get("resourceVersion", "0")
-            key = (ns, "CronJob", name, rv)
-            if seen_cache.seen(key):
-                continue
-            if namespaces and ns not in namespaces:
-                continue
-            tmpl = _cronjob_pod_template(d)
-            if tmpl:
-                yield podtemplate_to_request(ns, "CronJob", name, tmpl)
-    if "Pod" in kinds:
-        for obj in api_core.list_pod_for_all_namespaces().items:
-            d = obj.to_dict()
-            ns = d["metadata"]["namespace"]
-            name = d["metadata"]["name"]
-            rv = d["metadata"].get("resourceVersion", "0")
-            key = (ns, "Pod", name, rv)
-            if seen_cache.seen(key):
-                continue
-            if namespaces and ns not in namespaces:
-                continue
-            yield pod_to_request(d)
+    list_fns = _list_fns(api_apps, api_batch, api_core)
+    for kind in kinds:
+        if kind not in list_fns:
+            continue
+        for obj in _iter_raw_items(list_fns[kind]):
+            yield from handle_obj(kind, obj, namespaces, seen_cache)
 
 
 # ---------- CLI ----------
@@ -471,7 +683,7 @@ def _emit_from_obj(obj: Dict):
     else:
         raise SystemExit(f"Unsupported kind: {kind}")
 
-    print(ir.model_dump_json())
+    print(orjson.dumps(ir).decode())
 
 
 def main():
@@ -509,27 +721,35 @@ def main():
         out_f = _open_output(args.output)
 
         def _emit(ir):
-            line = ir.model_dump_json()
+            line = orjson.dumps(ir)
             if out_f:
-                out_f.write(line + "\n")
-            print(line)
+                out_f.write(line + b"\n")
+            print(line.decode())
+
+        # SIGTERM (pod shutdown, `timeout`) skips atexit; turn it into a normal exit
+        # so the finally below flushes the buffered NDJSON tail.
+        signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(128 + signum))
 
         seen_cache = SeenCache(ttl_sec=10)
         kinds = tuple(args.kinds)
         namespaces = args.namespaces
 
-        if args.emit_initial:
-            for ir in list_and_emit_initial(
+        try:
+            if args.emit_initial:
+                for ir in list_and_emit_initial(
+                    kinds, namespaces, args.kubeconfig, args.ca_file, args.verify_ssl, seen_cache
+                ):
+                    _post_if_needed(ir, args.post)
+                    _emit(ir)
+
+            for ir in stream_inference_requests(
                 kinds, namespaces, args.kubeconfig, args.ca_file, args.verify_ssl, seen_cache
             ):
                 _post_if_needed(ir, args.post)
                 _emit(ir)
-
-        for ir in stream_inference_requests(
-            kinds, namespaces, args.kubeconfig, args.ca_file, args.verify_ssl, seen_cache
-        ):
-            _post_if_needed(ir, args.post)
-            _emit(ir)
+        finally:
+            if out_f:
+                out_f.close()
     else:
         import yaml
         with open(args.path, "r") as f:
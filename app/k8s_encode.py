@@ -1,16 +1,22 @@
 #!/usr/bin/env python3
 """
 K8s InferenceRequest encoder:
-- Fit:   k8s_encode.py fit --input data.ndjson --out encoder.joblib [--no-sbert]
+- Fit:   k8s_encode.py fit --input data.ndjson --out encoder.joblib [--no-sbert] [--svd-components 64]
 - Trans: k8s_encode.py transform --input data.ndjson --encoder encoder.joblib --out features.parquet
 """
-import argparse, json, os, sys, hashlib
+import argparse, atexit, os, sys, sqlite3, threading
 from dataclasses import dataclass
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Dict, Iterable, Iterator, List, Optional, Any, Tuple
 
 import numpy as np
+import orjson
+from blake3 import blake3
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from scipy import sparse
 from sklearn.preprocessing import StandardScaler, OneHotEncoder
+from sklearn.decomposition import TruncatedSVD
 from sklearn.compose import ColumnTransformer
 from sklearn.pipeline import Pipeline
 from joblib import dump, load
@@ -29,14 +35,28 @@ TEXT_KEYS_TOP = ("workload_kind", "workload_name")
 CAT_KEYS = ("runtime_class", "node_type")
 NUM_KEYS = ("gpu_count", "init_container_count", "sidecar_count")
 
+SBERT_BATCH_SIZE = 256
+SVD_COMPONENTS = 64
+
+# NDJSON lines flattened/encoded/written per chunk (bounds peak memory)
+CHUNK_ROWS = 10_000
+
+# Opt-in on-disk SBERT embedding cache keyed by (model, _spec_hash): set to a sqlite path.
+EMB_CACHE_PATH = os.getenv("K8S_ENCODER_CACHE", "")
+
 # Per-container resources (flattened as sums; easy baseline)
 RES_KEYS = (
     "req_cpu_mcpu", "req_mem_mib",
     "lim_cpu_mcpu", "lim_mem_mib"
 )
 
+_NUM_COLS = list(NUM_KEYS) + list(RES_KEYS)
+_META_COLS = ("namespace", "workload_kind", "workload_name", "_spec_hash")
+
 def _sha16(obj: Any) -> str:
-    return hashlib.sha256(json.dumps(obj, sort_keys=True, default=str).encode()).hexdigest()[:16]
+    """64-bit content hash (16 hex chars) over canonical, key-sorted JSON bytes."""
+    data = orjson.dumps(obj, default=str, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS)
+    return blake3(data).hexdigest(length=8)
 
 def _text_bundle(ir: Dict[str, Any]) -> str:
     """Concatenate semantically meaningful strings for SBERT."""
@@ -97,19 +117,108 @@ def _flat_row(ir: Dict[str, Any]) -> Dict[str, Any]:
     return row
 
 
+_FLAT_COLS = ["namespace", "workload_kind", "workload_name", *CAT_KEYS, *NUM_KEYS, *RES_KEYS, "_text", "_spec_hash"]
+
+
+def _row_arrays(rows: Any) -> Tuple[np.ndarray, np.ndarray, Any]:
+    """(X_num float64, X_cat object, cols) from a flattened frame or a list of _flat_row dicts.
+    cols(key) returns that column as a list, without building a DataFrame for list input."""
+    if isinstance(rows, pd.DataFrame):
+        X_num = rows[_NUM_COLS].to_numpy(dtype=np.float64, na_value=0.0)
+        X_cat = rows[list(CAT_KEYS)].astype(object).fillna("NA").to_numpy(dtype=object)
+        return X_num, X_cat, lambda k: rows[k].tolist()
+    X_num = np.array([[float(r.get(k) or 0.0) for k in _NUM_COLS] for r in rows], dtype=np.float64)
+    X_cat = np.array([["NA" if r.get(k) is None else r.get(k) for k in CAT_KEYS] for r in rows], dtype=object)
+    return (X_num.reshape(len(rows), len(_NUM_COLS)), X_cat.reshape(len(rows), len(CAT_KEYS)),
+            lambda k: [r.get(k) for r in rows])
+
+
+def _drop_feature_names(est: Any) -> Any:
+    """Encoders fit before transform took ndarrays carry DataFrame column names; drop them
+    so sklearn does not warn on every ndarray transform."""
+    if est is not None and hasattr(est, "feature_names_in_"):
+        del est.feature_names_in_
+    return est
+
+
+# ---------- Embedding cache ----------
+class EmbeddingCache:
+    """sqlite-backed (model, spec_hash) -> float32 embedding store.
+    Safe to share across threads (one connection behind a lock); new rows are
+    buffered and committed in batches of _COMMIT_ROWS, plus on flush()/exit."""
+    _CHUNK = 500  # stay below SQLite's bound-parameter limit
+    _COMMIT_ROWS = 1024
+
+    def __init__(self, path: str):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._con = sqlite3.connect(path, check_same_thread=False)
+        self._con.execute(
+            "CREATE TABLE IF NOT EXISTS emb ("
+            " model TEXT NOT NULL, hash TEXT NOT NULL, vec BLOB NOT NULL,"
+            " PRIMARY KEY (model, hash))"
+        )
+        self._lock = threading.Lock()
+        self._pending: Dict[Tuple[str, str], bytes] = {}
+        atexit.register(self.flush)
+
+    def get_many(self, model: str, hashes: List[str]) -> Dict[str, np.ndarray]:
+        out: Dict[str, np.ndarray] = {}
+        with self._lock:
+            uniq = []
+            for h in set(hashes):
+                blob = self._pending.get((model, h))
+                if blob is None:
+                    uniq.append(h)
+                else:
+                    out[h] = np.frombuffer(blob, dtype=np.float32)
+            for i in range(0, len(uniq), self._CHUNK):
+                chunk = uniq[i:i + self._CHUNK]
+                q = f"SELECT hash, vec FROM emb WHERE model = ? AND hash IN ({','.join('?' * len(chunk))})"
+                for h, blob in self._con.execute(q, [model, *chunk]):
+                    out[h] = np.frombuffer(blob, dtype=np.float32)
+        return out
+
+    def put_many(self, model: str, items: Dict[str, np.ndarray]) -> None:
+        with self._lock:
+            for h, v in items.items():
+                self._pending[(model, h)] = np.asarray(v, dtype=np.float32).tobytes()
+            if len(self._pending) >= self._COMMIT_ROWS:
+                self._flush_locked()
+
+    def flush(self) -> None:
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self) -> None:
+        if not self._pending:
+            return
+        with self._con:
+            self._con.executemany(
+                "INSERT OR REPLACE INTO emb (model, hash, vec) VALUES (?, ?, ?)",
+                [(m, h, blob) for (m, h), blob in self._pending.items()],
+            )
+        self._pending = {}
+
+
 # ---------- Encoder class ----------
 @dataclass
 class K8sEncoder:
     use_sbert: bool = True
     sbert_model_name: str = "all-MiniLM-L6-v2"
+    svd_components: int = SVD_COMPONENTS  # 0 keeps full SBERT width
+    max_seq_length: Optional[int] = None  # SBERT token cap; None = model default (pinned at first load)
+    fp16: bool = False  # half-precision SBERT on CUDA (changes embeddings slightly)
 
     # fitted artifacts
     scaler: Optional[StandardScaler] = None
     ohe: Optional[OneHotEncoder] = None
+    svd: Optional[TruncatedSVD] = None
     sbert_name_: Optional[str] = None
 
-    # cached model (runtime only)
+    # cached model / embedding store / single-row dispatch tables (runtime only)
     _sbert_model: Any = None
+    _emb_cache: Any = None
+    _fast: Any = None
 
     def _ensure_sbert(self):
         if not self.use_sbert:
@@ -117,59 +226,211 @@ class K8sEncoder:
         if not _SBERT_AVAILABLE:
             raise RuntimeError("sentence-transformers not installed; run: pip install sentence-transformers")
         if self._sbert_model is None:
-            self._sbert_model = SentenceTransformer(self.sbert_model_name)
+            model = SentenceTransformer(self.sbert_model_name)
+            # keep the token cap the encoder was fit with, so serve-time embeddings match training
+            if self.max_seq_length is None:
+                self.max_seq_length = model.max_seq_length
+            else:
+                model.max_seq_length = self.max_seq_length
+            if self.fp16:
+                try:
+                    import torch
+                    if torch.cuda.is_available():
+                        model = model.to("cuda").half()
+                except Exception:
+                    pass
+            self._sbert_model = model
             self.sbert_name_ = self.sbert_model_name
 
+    def _ensure_emb_cache(self) -> Optional[EmbeddingCache]:
+        if self._emb_cache is None:
+            self._emb_cache = False
+            if EMB_CACHE_PATH:
+                try:
+                    self._emb_cache = EmbeddingCache(EMB_CACHE_PATH)
+                except Exception as e:
+                    print(f"[WARN] embedding cache disabled ({EMB_CACHE_PATH}): {e}", file=sys.stderr)
+        return self._emb_cache or None
+
     def fit(self, rows: List[Dict[str, Any]]):
         """Fit scalers/encoders from flattened rows."""
-        df = pd.DataFrame(rows)
-
-        # numeric matrix
-        X_num = df[list(NUM_KEYS) + list(RES_KEYS)].astype(float).fillna(0.0)
-        self.scaler = StandardScaler().fit(X_num)
-
-        # categorical
-        X_cat = df[list(CAT_KEYS)].astype(object).fillna("NA")
-        self.ohe = OneHotEncoder(handle_unknown="ignore", sparse_output=False)
-        self.ohe.fit(X_cat)
+        return self.fit_chunks([rows])
+
+    def fit_chunks(self, chunks: Iterable[Any]):
+        """Fit from an iterable of flattened-row chunks; only one chunk is held at a time."""
+        scaler = StandardScaler()
+        cats: Dict[str, set] = {k: set() for k in CAT_KEYS}
+        fit_svd = self.use_sbert and self.svd_components > 0
+        emb_by_hash: Dict[str, np.ndarray] = {}
+        n = 0
+        for rows in chunks:
+            if len(rows) == 0:
+                continue
+            n += len(rows)
+            X_num, X_cat, col = _row_arrays(rows)
+
+            # numeric matrix (running mean/var)
+            scaler.partial_fit(X_num)
+
+            # categorical (collect vocabularies)
+            for j, k in enumerate(CAT_KEYS):
+                cats[k].update(X_cat[:, j])
+
+            # training embeddings for the SVD projection (one per distinct spec)
+            if fit_svd:
+                hashes = [str(h) for h in col("_spec_hash")]
+                emb = self._encode_sbert([str(t) for t in col("_text")], hashes)
+                emb_by_hash.update(zip(hashes, emb))
+        if n == 0:
+            raise ValueError("No rows found in input.")
+        self.scaler = scaler
+        self._fast = None
+
+        # one row per category value (columns padded) -> same categories_ as fitting on all rows
+        width = max(len(v) for v in cats.values())
+        vocab = np.array([sorted(v) + [min(v)] * (width - len(v)) for v in cats.values()], dtype=object).T
+        self.ohe = OneHotEncoder(handle_unknown="ignore", sparse_output=True, dtype=np.float32)
+        self.ohe.fit(vocab)
 
         # sbert (no fitting, but we record model name)
         if self.use_sbert:
             self._ensure_sbert()
             self.sbert_name_ = self.sbert_model_name
+
+        # project SBERT vectors down to svd_components dims
+        self.svd = None
+        if fit_svd:
+            E = np.stack(list(emb_by_hash.values()))
+            k = min(self.svd_components, E.shape[0] - 1, E.shape[1] - 1)
+            if k >= 1:
+                self.svd = TruncatedSVD(n_components=k, random_state=0).fit(E)
+            else:
+                print("[WARN] too few distinct specs for SVD; keeping full SBERT width", file=sys.stderr)
         return self
 
-    def _encode_sbert(self, texts: List[str]) -> np.ndarray:
+    def _encode_sbert(self, texts: List[str], hashes: Optional[List[str]] = None) -> np.ndarray:
         if not self.use_sbert:
             # Return zeros if SBERT disabled
             return np.zeros((len(texts), 0), dtype=np.float32)
-        self._ensure_sbert()
-        emb = self._sbert_model.encode(texts, show_progress_bar=False, normalize_embeddings=True)
-        return np.asarray(emb, dtype=np.float32)
+        cache = self._ensure_emb_cache() if hashes is not None and texts else None
+        if cache is None:
+            return self._encode_texts(texts)
+
+        # only encode specs we have not embedded before with this model
+        # embeddings depend on the token cap and precision too, not just the model
+        self._ensure_sbert()  # resolves max_seq_length for the key
+        model_key = f"{self.sbert_name_ or self.sbert_model_name}@{self.max_seq_length}{'+fp16' if self.fp16 else ''}"
+        text_by_hash = dict(zip(hashes, texts))
+        try:
+            vecs = cache.get_many(model_key, list(text_by_hash))
+        except sqlite3.Error as e:
+            print(f"[WARN] embedding cache read failed: {e}", file=sys.stderr)
+            return self._encode_texts(texts)
+        miss = [h for h in text_by_hash if h not in vecs]
+        if miss:
+            new = dict(zip(miss, self._encode_texts([text_by_hash[h] for h in miss])))
+            vecs.update(new)
+            try:
+                cache.put_many(model_key, new)
+            except sqlite3.Error as e:
+                print(f"[WARN] embedding cache write failed: {e}", file=sys.stderr)
+        return np.stack([vecs[h] for h in hashes]).astype(np.float32, copy=False)
 
-    def transform(self, rows: List[Dict[str, Any]]) -> Tuple[np.ndarray, pd.DataFrame]:
-        """Return (X, meta_df)"""
-        df = pd.DataFrame(rows)
+    def _encode_texts(self, texts: List[str]) -> np.ndarray:
+        self._ensure_sbert()
+        if not texts:
+            dim = self._sbert_model.get_sentence_embedding_dimension() or 0
+            return np.zeros((0, dim), dtype=np.float32)
+        # replicas share text bundles: encode each distinct string once, then gather back
+        uniq, inv = np.unique(np.asarray(texts, dtype=object), return_inverse=True)
+        # encode() already length-sorts inputs internally, so batches are tightly packed
+        emb = self._sbert_model.encode(
+            uniq.tolist(), batch_size=SBERT_BATCH_SIZE, show_progress_bar=False,
+            normalize_embeddings=True, convert_to_numpy=True,
+        )
+        return np.asarray(emb, dtype=np.float32)[inv.reshape(-1)]
+
+    def _ensure_fast(self) -> Any:
+        """Precompute per-field dispatch for single-row transforms: scaler affine terms and
+        one-hot slot offsets, so a request is written straight into one float32 vector."""
+        if self._fast is None:
+            ohe, sc = self.ohe, self.scaler
+            if ohe is None or ohe.drop is not None or getattr(ohe, "_infrequent_enabled", False):
+                self._fast = False
+                return self._fast
+            n = len(_NUM_COLS)
+            mean = sc.mean_ if sc is not None and sc.with_mean else np.zeros(n)
+            scale = sc.scale_ if sc is not None and sc.with_std else np.ones(n)
+            slots, off = [], n
+            for cats in ohe.categories_:
+                slots.append({c: off + i for i, c in enumerate(cats.tolist())})
+                off += len(cats)
+            self._fast = (mean, scale, slots, off, ohe.handle_unknown == "ignore")
+        return self._fast
+
+    def _transform_one(self, row: Dict[str, Any], sparse_output: bool = False) -> Optional[Tuple[Any, pd.DataFrame]]:
+        """Fast path of transform() for one _flat_row dict; None means use the general path."""
+        fast = self._ensure_fast()
+        if not fast:
+            return None
+        mean, scale, slots, n_tab, ignore_unknown = fast
+        cols = []
+        for k, slot in zip(CAT_KEYS, slots):
+            j = slot.get("NA" if row.get(k) is None else row.get(k))
+            if j is None and not ignore_unknown:
+                return None  # let OneHotEncoder raise its usual error
+            cols.append(j)
+
+        X_txt = self._encode_sbert([str(row.get("_text"))], [str(row.get("_spec_hash"))])
+        if self.svd is not None:
+            X_txt = (X_txt @ self.svd.components_.T).astype(np.float32)
+
+        x = np.zeros((1, n_tab + X_txt.shape[1]), dtype=np.float32)
+        x[0, :len(_NUM_COLS)] = (np.array([float(row.get(k) or 0.0) for k in _NUM_COLS]) - mean) / scale
+        x[0, [j for j in cols if j is not None]] = 1.0
+        x[0, n_tab:] = X_txt[0]
+
+        meta_df = pd.DataFrame({k: [row.get(k)] for k in _META_COLS})
+        meta_df["vec_len"] = x.shape[1]
+        return (sparse.csr_matrix(x) if sparse_output else x), meta_df
+
+    def transform(self, rows: Any, sparse_output: bool = False) -> Tuple[Any, pd.DataFrame]:
+        """Return (X as dense float32 ndarray, meta_df) for a flattened frame or a list of _flat_row dicts.
+        The matrix is mostly dense (numeric + text blocks); sparse_output=True returns CSR instead."""
+        if isinstance(rows, list) and len(rows) == 1:
+            out = self._transform_one(rows[0], sparse_output)
+            if out is not None:
+                return out
+        X_num, X_cat, col = _row_arrays(rows)
 
         # numeric
-        X_num = df[list(NUM_KEYS) + list(RES_KEYS)].astype(float).fillna(0.0)
-        X_num = self.scaler.transform(X_num) if self.scaler else X_num.values
+        X_num = self.scaler.transform(X_num) if self.scaler else X_num
 
         # categorical
-        X_cat = df[list(CAT_KEYS)].astype(object).fillna("NA")
-        X_cat = self.ohe.transform(X_cat) if self.ohe else np.zeros((len(df), 0))
+        X_cat = self.ohe.transform(X_cat) if self.ohe else sparse.csr_matrix((len(X_cat), 0))
 
         # text
-        X_txt = self._encode_sbert(df["_text"].astype(str).tolist())
-
-        # concat
-        X = np.concatenate([X_num, X_cat, X_txt], axis=1)
+        X_txt = self._encode_sbert([str(t) for t in col("_text")], [str(h) for h in col("_spec_hash")])
+        if self.svd is not None:
+            X_txt = self.svd.transform(X_txt).astype(np.float32)
+
+        # concat (older encoders return the one-hot block dense)
+        if sparse_output:
+            X = sparse.hstack(
+                [sparse.csr_matrix(X_num), sparse.csr_matrix(X_cat), sparse.csr_matrix(X_txt)],
+                format="csr", dtype=np.float32,
+            )
+        else:
+            X = np.empty((X_num.shape[0], X_num.shape[1] + X_cat.shape[1] + X_txt.shape[1]), dtype=np.float32)
+            a, b = X_num.shape[1], X_num.shape[1] + X_cat.shape[1]
+            X[:, :a] = X_num
+            X[:, a:b] = X_cat.toarray() if sparse.issparse(X_cat) else X_cat
+            X[:, b:] = X_txt
 
         # meta (keep keys for later joins/debug)
-        meta_cols = ["namespace", "workload_kind", "workload_name", "_spec_hash"]
-        meta_df = df[meta_cols].copy()
+        meta_df = pd.DataFrame({k: col(k) for k in _META_COLS})
         meta_df["vec_len"] = X.shape[1]
-        return X.astype(np.float32), meta_df
+        return X, meta_df
 
     def save(self, path: str):
         dump({
@@ -178,52 +439,106 @@ class K8sEncoder:
             "sbert_name_": self.sbert_name_,
             "scaler": self.scaler,
             "ohe": self.ohe,
+            "svd_components": self.svd_components,
+            "svd": self.svd,
+            "max_seq_length": self.max_seq_length,
+            "fp16": self.fp16,
         }, path)
 
     @classmethod
     def load(cls, path: str) -> "K8sEncoder":
         d = load(path)
-        enc = cls(use_sbert=d["use_sbert"], sbert_model_name=d["sbert_model_name"])
-        enc.scaler = d["scaler"]
-        enc.ohe = d["ohe"]
+        enc = cls(use_sbert=d["use_sbert"], sbert_model_name=d["sbert_model_name"],
+                  svd_components=d.get("svd_components", 0),
+                  # older artifacts: model default length, full precision
+                  max_seq_length=d.get("max_seq_length"), fp16=d.get("fp16", False))
+        enc.scaler = _drop_feature_names(d["scaler"])
+        enc.ohe = _drop_feature_names(d["ohe"])
+        enc.svd = d.get("svd")
         enc.sbert_name_ = d.get("sbert_name_")
         return enc
 
 
 # ---------- CLI ----------
-def _read_ndjson(path: str) -> List[Dict[str, Any]]:
+def iter_ndjson_chunks(path: str, chunk: int = CHUNK_ROWS) -> Iterator[pd.DataFrame]:
+    """Yield flattened frames of up to `chunk` requests each."""
     rows = []
-    with open(path, "r") as f:
+    with open(path, "rb") as f:
         for line in f:
-            line = line.strip()
-            if not line: continue
+            if not line.strip(): continue
             try:
-                ir = json.loads(line)
+                ir = orjson.loads(line)
+                if not isinstance(ir, dict):
+                    raise TypeError(f"expected a JSON object, got {type(ir).__name__}")
                 rows.append(_flat_row(ir))
             except Exception as e:
                 print(f"[WARN] bad line skipped: {e}", file=sys.stderr)
-    return rows
+                continue
+            if len(rows) == chunk:
+                yield pd.DataFrame(rows, columns=_FLAT_COLS)
+                rows = []
+    if rows:
+        yield pd.DataFrame(rows, columns=_FLAT_COLS)
+
+def _read_ndjson(path: str) -> pd.DataFrame:
+    frames = list(iter_ndjson_chunks(path))
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=_FLAT_COLS)
 
 def cmd_fit(args):
-    rows = _read_ndjson(args.input)
-    if not rows:
-        raise SystemExit("No rows found in input.")
-    enc = K8sEncoder(use_sbert=(not args.no_sbert), sbert_model_name=args.sbert_model)
-    enc.fit(rows)
+    enc = K8sEncoder(use_sbert=(not args.no_sbert), sbert_model_name=args.sbert_model,
+                     svd_components=args.svd_components, max_seq_length=args.max_seq_length,
+                     fp16=args.fp16)
+    try:
+        enc.fit_chunks(iter_ndjson_chunks(args.input, args.chunk_size))
+    except ValueError as e:
+        raise SystemExit(str(e))
     os.makedirs(os.path.dirname(args.out), exist_ok=True)
     enc.save(args.out)
     print(f"[OK] saved encoder to {args.out}")
 
+META_SCHEMA = pa.schema([
+    ("namespace", pa.string()),
+    ("workload_kind", pa.string()),
+    ("workload_name", pa.string()),
+    ("_spec_hash", pa.string()),
+    ("vec_len", pa.int64()),
+])
+
+def _features_table(meta: pd.DataFrame, X: np.ndarray) -> pa.Table:
+    """meta columns + X as one fixed_size_list<float32> column (contiguous, no per-row objects)."""
+    X = np.ascontiguousarray(X, dtype=np.float32)
+    feat = pa.FixedSizeListArray.from_arrays(pa.array(X.reshape(-1), type=pa.float32()), X.shape[1])
+    meta_tbl = pa.Table.from_pandas(meta, schema=META_SCHEMA, preserve_index=False)
+    return meta_tbl.append_column("features", feat)
+
+def read_features(path: str) -> Tuple[np.ndarray, pd.DataFrame]:
+    """Read a features Parquet as one contiguous (N, d) float32 matrix plus the remaining columns.
+    Works for fixed_size_list (cmd_transform output) and plain list columns (pandas round-trips)."""
+    tbl = pq.read_table(path)
+    feats = tbl.column("features").combine_chunks()
+    flat = feats.flatten().to_numpy(zero_copy_only=False).astype(np.float32, copy=False)
+    X = flat.reshape(len(feats), -1) if len(feats) else np.zeros((0, 0), dtype=np.float32)
+    return X, tbl.drop_columns(["features"]).to_pandas()
+
 def cmd_transform(args):
-    rows = _read_ndjson(args.input)
     enc = K8sEncoder.load(args.encoder)
-    X, meta = enc.transform(rows)
-    # write Parquet (features as list column)
-    df = meta.copy()
-    df["features"] = [x.astype(np.float32) for x in X]
     os.makedirs(os.path.dirname(args.out), exist_ok=True)
-    df.to_parquet(args.out, index=False)
-    print(f"[OK] wrote {len(df)} rows to {args.out}; vector_dim={X.shape[1]}")
+    # write Parquet one row group per chunk (features as fixed-size list column)
+    writer, n, dim = None, 0, 0
+    try:
+        for rows in iter_ndjson_chunks(args.input, args.chunk_size):
+            X, meta = enc.transform(rows)
+            table = _features_table(meta, X)
+            if writer is None:
+                writer = pq.ParquetWriter(args.out, table.schema, compression="zstd", use_dictionary=True)
+            writer.write_table(table)
+            n, dim = n + table.num_rows, X.shape[1]
+    finally:
+        if writer is not None:
+            writer.close()
+    if writer is None:
+        raise SystemExit("No rows found in input.")
+    print(f"[OK] wrote {n} rows to {args.out}; vector_dim={dim}")
 
 def main():
     p = argparse.ArgumentParser()
@@ -234,11 +549,18 @@ def main():
     p_fit.add_argument("--out", required=True, help="Path to save encoder joblib.")
     p_fit.add_argument("--no-sbert", action="store_true", help="Disable SBERT text embeddings.")
     p_fit.add_argument("--sbert-model", default="all-MiniLM-L6-v2")
+    p_fit.add_argument("--svd-components", type=int, default=SVD_COMPONENTS,
+                       help="Reduce SBERT embeddings to this many dims (0 = keep full width).")
+    p_fit.add_argument("--chunk-size", type=int, default=CHUNK_ROWS, help="NDJSON lines per chunk.")
+    p_fit.add_argument("--max-seq-length", type=int, default=None,
+                       help="SBERT token cap (default: the model's own); saved with the encoder.")
+    p_fit.add_argument("--fp16", action="store_true", help="Half-precision SBERT on CUDA; saved with the encoder.")
 
     p_tr = sub.add_parser("transform", help="Transform NDJSON using a fitted encoder into Parquet.")
     p_tr.add_argument("--input", required=True)
     p_tr.add_argument("--encoder", required=True)
     p_tr.add_argument("--out", required=True)
+    p_tr.add_argument("--chunk-size", type=int, default=CHUNK_ROWS, help="NDJSON lines per chunk.")
 
     args = p.parse_args()
     if args.cmd == "fit": cmd_fit(args)
@@ -1,45 +1,68 @@
 #!/usr/bin/env python3
-import argparse, requests, numpy as np, pandas as pd
+import argparse, re, requests, numpy as np, orjson, pandas as pd
+import pyarrow as pa, pyarrow.parquet as pq
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from requests.adapters import HTTPAdapter
+
+from join_features_labels import align_categories, uncategorize
 
 # Optional K8s fallback for owner mapping
 from kubernetes import client as k8s_client, config as k8s_config
 from kubernetes.config.config_exception import ConfigException
 
+_RS = re.compile(r"-[a-f0-9]{9,}$")  # ReplicaSet "myapp-75b8db778" -> Deployment "myapp"
+
+# One keep-alive session so owner/power/energy queries share a connection pool.
+_S = requests.Session()
+_S.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=4))
+_S.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=4))
+
 def prom_range(prom_base: str, query: str, start: str, end: str, step: str) -> pd.DataFrame:
-    r = requests.get(
+    r = _S.get(
         f"{prom_base.rstrip('/')}/api/v1/query_range",
         params={"query": query, "start": start, "end": end, "step": step},
         timeout=30,
     )
     r.raise_for_status()
-    result = r.json().get("data", {}).get("result", [])
-    rows = []
+    result = orjson.loads(r.content).get("data", {}).get("result", [])
+    dfs = []
     for s in result:
-        metric = s.get("metric", {})
-        for ts, val in s.get("values", []):
-            rows.append({"ts": float(ts), "value": float(val), **metric})
-    df = pd.DataFrame(rows)
-    return df
+        vals = s.get("values")
+        if not vals:
+            continue
+        arr = np.asarray(vals, dtype=object)
+        df = pd.DataFrame({"ts": arr[:, 0].astype(np.float64), "value": arr[:, 1].astype(np.float64)})
+        dfs.append(df.assign(**s.get("metric", {})))
+    if not dfs:
+        return pd.DataFrame()
+    return pd.concat(dfs, ignore_index=True)
+
+# Only these columns are used downstream; other Prometheus labels are dropped early.
+_PROM_KEEP = ("ts", "value", "namespace", "pod", "owner_kind", "owner_name")
 
 def norm_ns_pod(df: pd.DataFrame) -> pd.DataFrame:
     if df is None or df.empty:
         return df
-    df = df.copy()
+    ren = {}
     # namespace
     if "namespace" not in df.columns:
         for cand in ("container_namespace", "pod_namespace", "kubernetes_namespace", "ns"):
             if cand in df.columns:
-                df.rename(columns={cand: "namespace"}, inplace=True)
+                ren[cand] = "namespace"
                 break
     # pod
     if "pod" not in df.columns:
         for cand in ("pod_name", "podname", "pod_uid", "podid"):
             if cand in df.columns:
-                df.rename(columns={cand: "pod"}, inplace=True)
+                ren[cand] = "pod"
                 break
-    return df
+    df = df.rename(columns=ren)
+    return df[[c for c in _PROM_KEEP if c in df.columns]]
 
-def get_owner_map_via_k8s(namespaces=None) -> pd.DataFrame:
+@lru_cache()
+def get_core_v1_api() -> k8s_client.CoreV1Api:
+    """Load kube config once (local, then in-cluster) and reuse one CoreV1Api."""
     try:
         try:
             k8s_config.load_kube_config()
@@ -47,23 +70,44 @@ def get_owner_map_via_k8s(namespaces=None) -> pd.DataFrame:
             k8s_config.load_incluster_config()
     except Exception as e:
         raise SystemExit(f"K8s config error: {e}")
+    return k8s_client.CoreV1Api()
 
-    v1 = k8s_client.CoreV1Api()
-    pods = v1.list_pod_for_all_namespaces().items
-    rows = []
-    for p in pods:
-        ns = p.metadata.namespace
-        if namespaces and ns not in namespaces:
-            continue
-        pod = p.metadata.name
-        orefs = p.metadata.owner_references or []
-        if orefs:
-            ok = orefs[0].kind
-            on = orefs[0].name
-        else:
-            ok, on = "Pod", pod
-        rows.append({"namespace": ns, "pod": pod, "owner_kind": ok, "owner_name": on})
-    return pd.DataFrame(rows)
+def _pod_owner(p) -> tuple:
+    orefs = p.metadata.owner_references or []
+    if orefs:
+        return orefs[0].kind, orefs[0].name
+    return "Pod", p.metadata.name
+
+def _list_pod_owners(v1: k8s_client.CoreV1Api) -> dict:
+    """One LIST -> {(ns, pod): (owner_kind, owner_name)}."""
+    return {(p.metadata.namespace, p.metadata.name): _pod_owner(p)
+            for p in v1.list_pod_for_all_namespaces().items}
+
+def get_owner_map_via_k8s(namespaces=None) -> pd.DataFrame:
+    """Pod -> owner map from a single pod LIST."""
+    idx = _list_pod_owners(get_core_v1_api())
+    recs = [(ns, pod, ok, on) for (ns, pod), (ok, on) in idx.items()
+            if not namespaces or ns in namespaces]
+    return pd.DataFrame.from_records(recs, columns=["namespace", "pod", "owner_kind", "owner_name"])
+
+def _diff_reset(v, edges):
+    """Consecutive differences clipped at 0, NaN at each group start (edges = starts + [n])."""
+    out = np.empty_like(v)
+    out[:1] = np.nan
+    np.subtract(v[1:], v[:-1], out=out[1:])
+    out[edges[:-1]] = np.nan
+    return np.maximum(out, 0.0)
+
+def add_energy_steps(energy: pd.DataFrame) -> pd.DataFrame:
+    """Sort by (namespace, pod, ts) and add the per-pod counter delta, clipped at 0, as energy_step_j."""
+    key = pd.Categorical(energy["namespace"].astype(str) + "\x00" + energy["pod"].astype(str)).codes
+    order = np.lexsort((energy["ts"].to_numpy(), key))
+    energy = energy.take(order)
+    key = key[order]
+    # group boundaries [start_0, start_1, ..., n] over the sorted rows
+    edges = np.append(np.flatnonzero(np.r_[True, key[1:] != key[:-1]]), len(key))
+    energy["energy_step_j"] = _diff_reset(energy["value"].to_numpy(dtype=np.float64), edges)
+    return energy
 
 def main():
     p = argparse.ArgumentParser()
@@ -84,17 +128,25 @@ def main():
         from urllib3.exceptions import InsecureRequestWarning
         urllib3.disable_warnings(InsecureRequestWarning)
 
+    # ---- Prometheus queries are independent: run them concurrently ----
+    def _submit(query):
+        return pool.submit(prom_range, args.prom, query, args.start, args.end, args.step)
+
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        owner_f = None
+        if args.owner_source in ("prom", "auto"):
+            # pull all kinds; we will normalize below
+            owner_f = _submit('max by(namespace,pod,owner_kind,owner_name) (kube_pod_owner)')
+        # POWER is optional in your build; try it, but it's OK if empty.
+        power_f = _submit('sum by (container_namespace,pod_name) (kepler_container_power_watt)')
+        # Your cluster exposes container-level energy; use that metric specifically.
+        energy_f = _submit('sum by (container_namespace,pod_name) (kepler_container_joules_total)')
+
     # ---- owner mapping (prefer prom) ----
     owner = pd.DataFrame()
-    if args.owner_source in ("prom", "auto"):
+    if owner_f is not None:
         try:
-            owner = prom_range(
-                args.prom,
-                # pull all kinds; we will normalize below
-                'max by(namespace,pod,owner_kind,owner_name) (kube_pod_owner)',
-                args.start, args.end, args.step
-            )
-            owner = norm_ns_pod(owner)
+            owner = norm_ns_pod(owner_f.result())
             if not owner.empty:
                 owner = owner[["namespace","pod","owner_kind","owner_name","ts"]]
         except Exception:
@@ -106,25 +158,15 @@ def main():
         owner = get_owner_map_via_k8s(namespaces=args.ns)  # no ts column here
 
     # ---- Kepler metrics ----
-    # POWER is optional in your build; try it, but it's OK if empty.
     try:
-        power = prom_range(
-            args.prom,
-            'sum by (container_namespace,pod_name) (kepler_container_power_watt)',
-            args.start, args.end, args.step
-        )
+        power = power_f.result()
     except Exception:
         power = pd.DataFrame()
     power = norm_ns_pod(power)
     if not power.empty:
         power.rename(columns={"value": "avg_power_w"}, inplace=True)
 
-    # Your cluster exposes container-level energy; use that metric specifically.
-    energy = prom_range(
-        args.prom,
-        'sum by (container_namespace,pod_name) (kepler_container_joules_total)',
-        args.start, args.end, args.step
-    )
+    energy = energy_f.result()
     energy = norm_ns_pod(energy) if energy is not None else pd.DataFrame()
     # Drop any rows that still don't have namespace/pod (e.g., node/system series)
     if not energy.empty:
@@ -135,10 +177,8 @@ def main():
             # (shouldn't happen now, but safe)
             pass
         energy = energy.dropna(subset=["namespace","pod"], how="any")
-        if not energy.empty:
-            energy = energy.sort_values(["namespace","pod","ts"])
     if not energy.empty:
-        energy["energy_step_j"] = energy.groupby(["namespace","pod"])["value"].diff().clip(lower=0.0)
+        energy = add_energy_steps(energy)
 
     # ---- build label table robustly ----
     if power.empty and energy.empty:
@@ -152,6 +192,7 @@ def main():
         energy = power[["namespace","pod","ts"]].copy()
         energy["energy_step_j"] = np.nan
 
+    align_categories([power, energy, owner], ("namespace", "pod"))
     lab = power.merge(energy[["namespace","pod","ts","energy_step_j"]],
                       on=["namespace","pod","ts"], how="left")
 
@@ -161,31 +202,30 @@ def main():
         lab = lab.merge(owner, on=["namespace","pod"], how="left")
 
     # --- normalize owner to match features keys ---
-    import re
-    def _rs_to_deploy(name: str) -> str:
-        # ReplicaSet "myapp-75b8db778" -> Deployment "myapp"
-        return re.sub(r"-[a-f0-9]{9,}$", "", name or "")
-
     wk = lab["owner_kind"].fillna("Pod")
-    wn = lab["owner_name"].copy()
+    wn = lab["owner_name"].astype(object)
     # Map ReplicaSet → Deployment (name without RS suffix)
     rs_mask = wk.eq("ReplicaSet") & wn.notna()
-    wk.loc[rs_mask] = "Deployment"
-    wn.loc[rs_mask] = wn.loc[rs_mask].map(_rs_to_deploy)
+    wk = wk.mask(rs_mask, "Deployment")
+    wn = wn.where(~rs_mask, wn.str.replace(_RS, "", regex=True))
     # Fall back
     wn = wn.fillna(lab["pod"])
     lab["workload_kind"] = wk
     lab["workload_name"] = wn
 
     if args.mode == "job":
-        out = lab.groupby(["namespace","workload_kind","workload_name","pod"], as_index=False).agg(
+        out = lab.groupby(["namespace","workload_kind","workload_name","pod"], as_index=False, observed=True).agg(
             avg_power_w=("avg_power_w","mean"),
             total_energy_j=("energy_step_j","sum"),
         )
     else:
         out = lab[["ts","namespace","workload_kind","workload_name","pod","avg_power_w","energy_step_j"]].copy()
 
-    out.to_parquet(args.out, index=False)
+    pq.write_table(
+        pa.Table.from_pandas(uncategorize(out), preserve_index=False), args.out,
+        row_group_size=1_000_000, data_page_size=1 << 20, compression="zstd",
+        use_dictionary=["namespace", "workload_kind", "workload_name", "pod"],
+    )
     print(f"[OK] wrote {len(out)} rows to {args.out}")
 
 if __name__ == "__main__":
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Cosine k-NN regressor used by train_power.py / predict_service.py.
+
+Rows are L2-normalized once at fit time, so cosine similarity is a plain inner
+product. Neighbours come from a FAISS index when faiss is installed
+(IndexFlatIP, or IndexHNSWFlat with hnsw_m > 0) and from a NumPy matmul
+otherwise. Drop-in for KNeighborsRegressor(metric="cosine"): predict() is the
+unweighted mean of the k nearest targets.
+"""
+from typing import Any, Tuple
+
+import numpy as np
+from scipy import sparse
+
+# --- optional FAISS (falls back to NumPy brute force)
+try:
+    import faiss
+    _FAISS_AVAILABLE = True
+except Exception:
+    _FAISS_AVAILABLE = False
+
+# Query rows per NumPy similarity block (bounds the (rows x n_train) buffer)
+QUERY_BLOCK = 1024
+
+
+def _l2_normalize(X: Any) -> np.ndarray:
+    X = X.toarray() if sparse.issparse(X) else np.asarray(X)
+    X = np.ascontiguousarray(X, dtype=np.float32)
+    norms = np.linalg.norm(X, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0  # zero rows stay zero (similarity 0 == cosine distance 1)
+    return X / norms
+
+
+class CosineKNNRegressor:
+    def __init__(self, n_neighbors: int = 5, hnsw_m: int = 0):
+        self.n_neighbors = n_neighbors
+        self.hnsw_m = hnsw_m
+        self._index = None
+
+    def fit(self, X: Any, y: Any) -> "CosineKNNRegressor":
+        self.X_ = _l2_normalize(X)
+        self.y_ = np.asarray(y, dtype=np.float64)
+        self._index = None
+        if _FAISS_AVAILABLE:
+            self._build_index()
+        return self
+
+    def _build_index(self) -> None:
+        d = self.X_.shape[1]
+        if self.hnsw_m > 0:
+            idx = faiss.IndexHNSWFlat(d, self.hnsw_m, faiss.METRIC_INNER_PRODUCT)
+        else:
+            idx = faiss.IndexFlatIP(d)
+        idx.add(self.X_)
+        self._index = idx
+
+    def kneighbors(self, X: Any) -> Tuple[np.ndarray, np.ndarray]:
+        """Return (similarities, indices) of the k nearest training rows, best first."""
+        Q = _l2_normalize(X)
+        k = min(self.n_neighbors, self.X_.shape[0])
+        if self._index is None:
+            return self._exact_search(Q, k)
+        sims, inds = self._index.search(Q, k)
+        # HNSW can come back short of k hits (padded with -1); redo those rows exactly
+        short = (inds < 0).any(axis=1)
+        if short.any():
+            sims[short], inds[short] = self._exact_search(Q[short], k)
+        return sims, inds
+
+    def _exact_search(self, Q: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        sims = np.empty((Q.shape[0], k), dtype=np.float32)
+        inds = np.empty((Q.shape[0], k), dtype=np.int64)
+        for s in range(0, Q.shape[0], QUERY_BLOCK):
+            S = Q[s:s + QUERY_BLOCK] @ self.X_.T
+            top = np.argpartition(-S, k - 1, axis=1)[:, :k]
+            top_s = np.take_along_axis(S, top, axis=1)
+            order = np.argsort(-top_s, axis=1)
+            inds[s:s + QUERY_BLOCK] = np.take_along_axis(top, order, axis=1)
+            sims[s:s + QUERY_BLOCK] = np.take_along_axis(top_s, order, axis=1)
+        return sims, inds
+
+    def predict(self, X: Any) -> np.ndarray:
+        _, inds = self.kneighbors(X)
+        return self.y_[inds].mean(axis=1)
+
+    # FAISS indexes don't pickle; store the serialized bytes and restore on load
+    # (or fall back to NumPy search if faiss is missing where the model is loaded).
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        idx = state.pop("_index", None)
+        state["_index_bytes"] = faiss.serialize_index(idx) if idx is not None else None
+        return state
+
+    def __setstate__(self, state):
+        buf = state.pop("_index_bytes", None)
+        self.__dict__.update(state)
+        self._index = faiss.deserialize_index(buf) if buf is not None and _FAISS_AVAILABLE else None
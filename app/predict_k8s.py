@@ -1,5 +1,6 @@
 #!/usr/bin/env python3
-import argparse, joblib, json, numpy as np, pandas as pd
+import argparse, joblib, json
+from k8s_encode import K8sEncoder, iter_ndjson_chunks
 
 def main():
     p = argparse.ArgumentParser()
@@ -8,30 +9,19 @@ def main():
     p.add_argument("--input", required=True, help="NDJSON from k8s_collect (one or many lines)")
     args = p.parse_args()
 
-    # reuse the encoder CLI to transform
-    import subprocess, tempfile, os
-    tmp = tempfile.NamedTemporaryFile(delete=False, suffix=".parquet")
-    tmp.close()
-    cmd = ["python", "k8s_encode.py", "transform",
-           "--input", args.input, "--encoder", args.encoder, "--out", tmp.name]
-    subprocess.check_call(cmd)
-
-    df = pd.read_parquet(tmp.name)
-    X = np.stack(df["features"].to_numpy())
-
+    # encode in-process, chunk by chunk (same path as predict_service)
+    enc = K8sEncoder.load(args.encoder)
     model = joblib.load(args.model)
-    preds = model.predict(X).tolist()
 
     out = []
-    for meta, y in zip(df[["namespace","workload_kind","workload_name","_spec_hash"]].to_dict(orient="records"), preds):
-        meta["pred_avg_power_w"] = float(y)
-        out.append(meta)
+    for rows in iter_ndjson_chunks(args.input):
+        X, df = enc.transform(rows)
+        preds = model.predict(X).tolist()
+        for meta, y in zip(df[["namespace","workload_kind","workload_name","_spec_hash"]].to_dict(orient="records"), preds):
+            meta["pred_avg_power_w"] = float(y)
+            out.append(meta)
 
     print(json.dumps(out, indent=2))
 
 if __name__ == "__main__":
     main()
-
-
-
-=? numpy array 393 features
\ No newline at end of file
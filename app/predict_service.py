@@ -2,13 +2,15 @@
 import os, uvicorn, numpy as np, pandas as pd
 from fastapi import FastAPI, Body, HTTPException
 from pydantic import BaseModel, ValidationError
-import io, yaml
+import io, threading, yaml
+from collections import OrderedDict
+from functools import lru_cache
 from joblib import load
 from typing import Dict, Any, List
 
 from k8s_encode import K8sEncoder, _flat_row    # reuse your encoder utils
 from models import InferenceRequest             # your schema
-from k8s_collect import podtemplate_to_request
+from k8s_collect import podtemplate_to_request, to_model
 
 # path ="/opt/local-path-provisioner/pvc-dde8a16d-5550-41b8-ac85-e75d5e49b7fc_energy_podpower-data"
 
@@ -31,19 +33,52 @@ class PredictOut(BaseModel):
     namespace: str
     spec_hash: str
 
+# LRU of predictions keyed by _spec_hash (a hash of the full request), so
+# repeated manifests skip the encoder and the model entirely.
+PRED_CACHE_SIZE = 4096
+_PRED_CACHE: "OrderedDict[str, PredictOut]" = OrderedDict()
+_PRED_LOCK = threading.Lock()
+
+def _predict_rows(rows: List[Dict[str, Any]]) -> List[PredictOut]:
+    """Predict flat rows; cache misses go through one enc.transform + model.predict."""
+    outs: List[Any] = [None] * len(rows)
+    miss = []
+    with _PRED_LOCK:
+        for i, row in enumerate(rows):
+            hit = _PRED_CACHE.get(row["_spec_hash"])
+            if hit is None:
+                miss.append(i)
+            else:
+                _PRED_CACHE.move_to_end(row["_spec_hash"])
+                outs[i] = hit
+    if miss:
+        X, meta = enc.transform([rows[i] for i in miss])
+        ys = model.predict(X)
+        for i, y, m in zip(miss, ys, meta.to_dict("records")):
+            outs[i] = PredictOut(
+                pred_energy_step_j=float(y),
+                workload_kind=m["workload_kind"],
+                workload_name=m["workload_name"],
+                namespace=m["namespace"],
+                spec_hash=m["_spec_hash"],
+            )
+        with _PRED_LOCK:
+            for i in miss:
+                _PRED_CACHE[rows[i]["_spec_hash"]] = outs[i]
+            while len(_PRED_CACHE) > PRED_CACHE_SIZE:
+                _PRED_CACHE.popitem(last=False)
+    return outs
+
+def _predict_row(row: Dict[str, Any]) -> PredictOut:
+    return _predict_rows([row])[0]
+
 @app.post("/predict", response_model=PredictOut)
 def predict(ir: InferenceRequest):
-    row = _flat_row(ir.model_dump())
-    X, meta = enc.transform([row])
-    y = float(model.predict(X)[0])
-    m = meta.iloc[0].to_dict()
-    return PredictOut(
-        pred_energy_step_j=y,
-        workload_kind=m["workload_kind"],
-        workload_name=m["workload_name"],
-        namespace=m["namespace"],
-        spec_hash=m["_spec_hash"],
-    )
+    return _predict_row(_flat_row(ir.model_dump()))
+
+@app.post("/predict/batch", response_model=List[PredictOut])
+def predict_batch(irs: List[InferenceRequest]):
+    return _predict_rows([_flat_row(ir.model_dump()) for ir in irs])
 
 
 # --- YAML → InferenceRequest helpers & endpoints ---
@@ -56,13 +91,13 @@ def _build_ir_from_obj(obj: dict) -> InferenceRequest:
     try:
         if kind == "Deployment":
             tmpl = spec["template"]
-            return podtemplate_to_request(ns, "Deployment", name, tmpl)
+            return to_model(podtemplate_to_request(ns, "Deployment", name, tmpl))
         elif kind == "Job":
             tmpl = spec["template"]
-            return podtemplate_to_request(ns, "Job", name, tmpl, parent_spec=spec)
+            return to_model(podtemplate_to_request(ns, "Job", name, tmpl, parent_spec=spec))
         elif kind == "CronJob":
             jt = spec["jobTemplate"]["spec"]["template"]
-            return podtemplate_to_request(ns, "CronJob", name, jt)
+            return to_model(podtemplate_to_request(ns, "CronJob", name, jt))
         else:
             raise HTTPException(status_code=400, detail=f"Unsupported kind: {kind}. Use Deployment/Job/CronJob.")
     except KeyError as e:
@@ -90,8 +125,9 @@ def infer_from_yaml(yaml_text: str = Body(..., media_type="text/plain")):
     return irs
 
 
-@app.post("/predict/from-yaml", tags=["Prediction"], summary="Predict directly from YAML manifest", response_model=PredictOut)
-def predict_from_yaml(yaml_text: str = Body(..., media_type="text/plain")):
+@lru_cache(maxsize=1024)
+def _flatten_yaml(yaml_text: str) -> Dict[str, Any]:
+    """YAML text -> flat encoder row for the first manifest (memoized; errors are not cached)."""
     try:
         docs = list(yaml.safe_load_all(io.StringIO(yaml_text)))
     except yaml.YAMLError as e:
@@ -102,16 +138,11 @@ def predict_from_yaml(yaml_text: str = Body(..., media_type="text/plain")):
     if first_doc is None:
         raise HTTPException(status_code=400, detail="No object manifests found in YAML.")
     ir = _build_ir_from_obj(first_doc)
-    row = _flat_row(ir.model_dump())
-    X, meta = enc.transform([row])
-    y = float(model.predict(X)[0])
-    m = meta.iloc[0].to_dict()
-    return PredictOut(
-        pred_energy_step_j=y,
-        workload_kind=m["workload_kind"],
-        workload_name=m["workload_name"],
-        namespace=m["namespace"],
-        spec_hash=m["_spec_hash"],
-    )
+    return _flat_row(ir.model_dump())
+
+
+@app.post("/predict/from-yaml", tags=["Prediction"], summary="Predict directly from YAML manifest", response_model=PredictOut)
+def predict_from_yaml(yaml_text: str = Body(..., media_type="text/plain")):
+    return _predict_row(_flatten_yaml(yaml_text))
 if __name__ == "__main__":
     uvicorn.run("predict_service:app", host="0.0.0.0", port=8000)
\ No newline at end of file
@@ -1,20 +1,30 @@
 #!/usr/bin/env python3
-import argparse, joblib, numpy as np, pandas as pd
-from sklearn.neighbors import KNeighborsRegressor
+import argparse, joblib, numpy as np
+from joblib import Parallel, delayed
+from k8s_encode import read_features
+from knn_index import CosineKNNRegressor
 from sklearn.model_selection import GroupKFold
 from sklearn.metrics import mean_absolute_error, r2_score
 
+def _fit_fold(X, y, tr, va, neighbors, hnsw_m):
+    model = CosineKNNRegressor(n_neighbors=neighbors, hnsw_m=hnsw_m)
+    model.fit(X[tr], y[tr])
+    pva = model.predict(X[va])
+    return mean_absolute_error(y[va], pva), r2_score(y[va], pva)
+
 def main():
     p = argparse.ArgumentParser()
     p.add_argument("--train", required=True)  # ./data/train_rows.parquet
     p.add_argument("--target", choices=["avg_power_w","energy_step_j","total_energy_j"], default="avg_power_w")
     p.add_argument("--out", required=True)   # model path
     p.add_argument("--neighbors", type=int, default=5)
+    p.add_argument("--hnsw-m", type=int, default=0,
+                   help="FAISS HNSW graph degree (approximate search); 0 = exact inner-product index.")
+    p.add_argument("--n-jobs", type=int, default=-1, help="Parallel CV folds (joblib); -1 = all cores.")
     args = p.parse_args()
 
-    df = pd.read_parquet(args.train)
-    # features is an array column
-    X = np.stack(df["features"].to_numpy())
+    # features come back as one contiguous (N, d) float32 matrix
+    X, df = read_features(args.train)
     y = df[args.target].astype(float).to_numpy()
     # filter invalid targets
     keep = np.isfinite(y)
@@ -31,18 +41,16 @@ def main():
         raise SystemExit("Need at least 2 distinct workloads for CV. Collect more data.")
     gkf = GroupKFold(n_splits=n_splits)
 
-    maes, r2s = [], []
-    for tr, va in gkf.split(X, y, groups):
-        model = KNeighborsRegressor(n_neighbors=args.neighbors, metric="cosine")
-        model.fit(X[tr], y[tr])
-        pva = model.predict(X[va])
-        maes.append(mean_absolute_error(y[va], pva))
-        r2s.append(r2_score(y[va], pva))
+    results = Parallel(n_jobs=args.n_jobs)(
+        delayed(_fit_fold)(X, y, tr, va, args.neighbors, args.hnsw_m)
+        for tr, va in gkf.split(X, y, groups)
+    )
+    maes, r2s = zip(*results)
 
     print(f"CV MAE: {np.mean(maes):.3f} ± {np.std(maes):.3f} | R2: {np.mean(r2s):.3f}")
 
     # train on all
-    model = KNeighborsRegressor(n_neighbors=args.neighbors, metric="cosine")
+    model = CosineKNNRegressor(n_neighbors=args.neighbors, hnsw_m=args.hnsw_m)
     model.fit(X, y)
     joblib.dump(model, args.out)
     print(f"[OK] saved model to {args.out}")